@@ -0,0 +1,254 @@
+# file: core/analytics.py
+import argparse, json, os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.logger import LOG_PATH
+
+SUMMARY_PATH = LOG_PATH.parent / "trades_summary.json"
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def match_fifo(is_buy, qty, price, ts, lot_qty, lot_price, lot_ts):
+    """
+    Vectorized FIFO matching of one symbol's trades against carried-over open lots.
+
+    Sells only consume inventory bought before them; any sell quantity beyond the running
+    inventory (e.g. a log that starts mid-position) is reported as unmatched, not shorted.
+
+    Arguments:
+    - is_buy, qty, price, ts (np.ndarray): Trades in log order; ts in epoch seconds.
+    - lot_qty, lot_price, lot_ts (np.ndarray): Open buy lots from earlier chunks, oldest first.
+
+    Returns:
+    - dict: Matched segments ("seg_qty", "seg_pnl", "seg_hold", "seg_sell" index into the
+      chunk's sells), per-sell "sell_matched" quantities, "unmatched_qty" and the remaining
+      open lots ("lot_qty", "lot_price", "lot_ts").
+    """
+    # Running inventory reflected at zero: the floor tracks how much has been oversold so far
+    signed = np.where(is_buy, qty, -qty)
+    level = lot_qty.sum() + np.cumsum(signed)
+    floor = np.minimum.accumulate(np.minimum(level, 0.0))
+    unmatched = -np.diff(floor, prepend=0.0)
+
+    all_lot_qty = np.concatenate([lot_qty, qty[is_buy]])
+    all_lot_price = np.concatenate([lot_price, price[is_buy]])
+    all_lot_ts = np.concatenate([lot_ts, ts[is_buy]])
+    sell_matched = (qty - unmatched)[~is_buy]
+    sell_price = price[~is_buy]
+    sell_ts = ts[~is_buy]
+
+    lot_end = np.cumsum(all_lot_qty)
+    sell_end = np.cumsum(sell_matched)
+    total = sell_end[-1] if len(sell_end) else 0.0
+
+    # Every lot or sell boundary inside the matched range starts a new (lot, sell) segment
+    points = np.unique(np.concatenate([[0.0], lot_end[lot_end < total], sell_end]))
+    starts = points[:-1]
+    seg_qty = np.diff(points)
+    keep = seg_qty > 0
+    starts, seg_qty = starts[keep], seg_qty[keep]
+    lot_idx = np.searchsorted(lot_end, starts, side="right")
+    sell_idx = np.searchsorted(sell_end, starts, side="right")
+
+    remaining = lot_end > total
+    return {
+        "seg_qty": seg_qty,
+        "seg_pnl": seg_qty * (sell_price[sell_idx] - all_lot_price[lot_idx]),
+        "seg_hold": sell_ts[sell_idx] - all_lot_ts[lot_idx],
+        "seg_sell": sell_idx,
+        "sell_matched": sell_matched,
+        "unmatched_qty": float(unmatched.sum()),
+        "lot_qty": lot_end[remaining] - np.maximum(total, lot_end[remaining] - all_lot_qty[remaining]),
+        "lot_price": all_lot_price[remaining],
+        "lot_ts": all_lot_ts[remaining],
+    }
+
+
+class _SymbolLedger:
+    """ FIFO lots and running totals for one symbol, carried across chunks. """
+
+    def __init__(self):
+        self.lot_qty = np.empty(0)
+        self.lot_price = np.empty(0)
+        self.lot_ts = np.empty(0)
+        self.realized = 0.0
+        self.matched_qty = 0.0
+        self.hold_qty_seconds = 0.0
+        self.hold_qty = 0.0
+        self.round_trips = 0
+        self.wins = 0
+        self.unmatched_qty = 0.0
+        self.turnover = 0.0
+        self.trades = 0
+        self.last_price = None
+
+    def add(self, is_buy, qty, price, ts):
+        result = match_fifo(is_buy, qty, price, ts, self.lot_qty, self.lot_price, self.lot_ts)
+        self.lot_qty, self.lot_price, self.lot_ts = result["lot_qty"], result["lot_price"], result["lot_ts"]
+
+        self.realized += result["seg_pnl"].sum()
+        self.matched_qty += result["seg_qty"].sum()
+        timed = ~np.isnan(result["seg_hold"])
+        self.hold_qty_seconds += (result["seg_qty"][timed] * result["seg_hold"][timed]).sum()
+        self.hold_qty += result["seg_qty"][timed].sum()
+
+        sell_pnl = np.bincount(result["seg_sell"], weights=result["seg_pnl"], minlength=len(result["sell_matched"]))
+        closed = result["sell_matched"] > 0
+        self.round_trips += int(closed.sum())
+        self.wins += int((sell_pnl[closed] > 0).sum())
+        self.unmatched_qty += result["unmatched_qty"]
+
+        self.turnover += (qty * price).sum()
+        self.trades += len(qty)
+        self.last_price = float(price[-1])
+
+    def summary(self):
+        open_qty = self.lot_qty.sum()
+        unrealized = (self.lot_qty * (self.last_price - self.lot_price)).sum() if open_qty else 0.0
+        return {
+            "trades": self.trades,
+            "realized_pnl": round(float(self.realized), 2),
+            "unrealized_pnl": round(float(unrealized), 2),
+            "total_pnl": round(float(self.realized + unrealized), 2),
+            "round_trips": self.round_trips,
+            "win_rate": round(self.wins / self.round_trips, 4) if self.round_trips else None,
+            "avg_holding_minutes": round(self.hold_qty_seconds / self.hold_qty / 60, 2) if self.hold_qty else None,
+            "matched_qty": float(self.matched_qty),
+            "unmatched_sell_qty": float(self.unmatched_qty),
+            "open_qty": float(open_qty),
+            "avg_cost": round(float((self.lot_qty * self.lot_price).sum() / open_qty), 4) if open_qty else None,
+            "last_price": self.last_price,
+            "turnover": round(float(self.turnover), 2),
+        }
+
+
+def summarize_trades(log_path=LOG_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Streams the trade log in chunks and computes FIFO round-trip PnL and order statistics.
+
+    Memory is bounded by the chunk size plus the open lots per symbol, so it works on logs
+    far larger than RAM. Rows are assumed to be in log (chronological) order.
+    """
+    ledgers = {}
+    order_types = {}
+    rows = skipped = chunks = 0
+
+    reader = pd.read_csv(
+        log_path,
+        usecols=["timestamp", "symbol", "side", "quantity", "price", "order_type"],
+        dtype={"symbol": "string", "side": "string", "order_type": "string"},
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        chunks += 1
+        rows += len(chunk)
+        chunk["quantity"] = pd.to_numeric(chunk["quantity"], errors="coerce")
+        chunk["price"] = pd.to_numeric(chunk["price"], errors="coerce")
+        chunk["side"] = chunk["side"].str.lower()
+        valid = (
+            chunk["symbol"].notna() & chunk["side"].isin(["buy", "sell"])
+            & (chunk["quantity"] > 0) & (chunk["price"] > 0)
+        )
+        skipped += int((~valid).sum())
+        chunk = chunk[valid]
+        if chunk.empty:
+            continue
+
+        stamps = pd.to_datetime(chunk["timestamp"], errors="coerce")
+        chunk = chunk.assign(
+            ts=(stamps - pd.Timestamp(0)).dt.total_seconds(),
+            notional=chunk["quantity"] * chunk["price"],
+        )
+
+        stats = chunk.groupby([chunk["order_type"].fillna("unknown"), "side"]).agg(
+            count=("quantity", "size"), quantity=("quantity", "sum"), notional=("notional", "sum")
+        )
+        for (order_type, side), row in stats.iterrows():
+            entry = order_types.setdefault(order_type, {}).setdefault(side, {"count": 0, "quantity": 0.0, "notional": 0.0})
+            entry["count"] += int(row["count"])
+            entry["quantity"] += float(row["quantity"])
+            entry["notional"] += float(row["notional"])
+
+        for sym, group in chunk.groupby("symbol", sort=False):
+            ledgers.setdefault(sym, _SymbolLedger()).add(
+                (group["side"] == "buy").to_numpy(),
+                group["quantity"].to_numpy(dtype=float),
+                group["price"].to_numpy(dtype=float),
+                group["ts"].to_numpy(dtype=float),
+            )
+
+    symbols = {sym: ledger.summary() for sym, ledger in ledgers.items()}
+    for sides in order_types.values():
+        for entry in sides.values():
+            entry["avg_price"] = round(entry["notional"] / entry["quantity"], 4) if entry["quantity"] else None
+            entry["notional"] = round(entry["notional"], 2)
+
+    round_trips = sum(s["round_trips"] for s in symbols.values())
+    wins = sum(ledgers[sym].wins for sym in symbols)
+    hold_qty = sum(ledger.hold_qty for ledger in ledgers.values())
+    hold_qty_seconds = sum(ledger.hold_qty_seconds for ledger in ledgers.values())
+    realized = sum(s["realized_pnl"] for s in symbols.values())
+    unrealized = sum(s["unrealized_pnl"] for s in symbols.values())
+    return {
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "source": str(log_path),
+        "rows": rows,
+        "skipped_rows": skipped,
+        "chunks": chunks,
+        "totals": {
+            "realized_pnl": round(realized, 2),
+            "unrealized_pnl": round(unrealized, 2),
+            "total_pnl": round(realized + unrealized, 2),
+            "round_trips": round_trips,
+            "win_rate": round(wins / round_trips, 4) if round_trips else None,
+            "avg_holding_minutes": round(float(hold_qty_seconds / hold_qty / 60), 2) if hold_qty else None,
+            "turnover": round(sum(s["turnover"] for s in symbols.values()), 2),
+            "unmatched_sell_qty": sum(s["unmatched_sell_qty"] for s in symbols.values()),
+        },
+        "symbols": symbols,
+        "order_types": order_types,
+    }
+
+
+def write_summary(summary, path=SUMMARY_PATH):
+    """ Writes the summary via temp file + rename so the dashboard never reads a partial file. """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(summary, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_summary(path=SUMMARY_PATH):
+    """ Returns the last written summary, or None if analytics have not been run yet. """
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FIFO round-trip PnL and order statistics from the trade log")
+    parser.add_argument("--log", default=str(LOG_PATH), help="Trade log CSV (default: logs/trades.csv)")
+    parser.add_argument("--out", default=str(SUMMARY_PATH), help="Summary JSON (default: logs/trades_summary.json)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk")
+    args = parser.parse_args()
+
+    summary = summarize_trades(args.log, chunksize=args.chunksize)
+    write_summary(summary, args.out)
+
+    totals = summary["totals"]
+    win_rate = f"{totals['win_rate']:.1%}" if totals["win_rate"] is not None else "n/a"
+    print(f"📒 {summary['rows']} rows in {summary['chunks']} chunks ({summary['skipped_rows']} skipped)")
+    print(f"💰 Realized ${totals['realized_pnl']:.2f} | Unrealized ${totals['unrealized_pnl']:.2f} | Total ${totals['total_pnl']:.2f}")
+    print(f"🔁 Round trips {totals['round_trips']} | Win rate {win_rate} | Avg hold {totals['avg_holding_minutes']} min | Turnover ${totals['turnover']:.2f}")
+    print(f"✅ Summary written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,104 @@
 import requests
 from requests.auth import HTTPBasicAuth
 import time
+from core.circuit_breaker import CircuitBreaker
 
 BASE_URL = "http://82.29.197.23:8000"
 USER_ID = "2"
 PASSWORD = "Ahojpepiku45"
 auth = HTTPBasicAuth(USER_ID, PASSWORD)
+REQUEST_TIMEOUT = 5  # Seconds; bounds how long a dead endpoint can stall a tick
+
+# --- ENDPOINT HEALTH ---
+breaker_settings = {}
+_breakers = {}
+_last_known = {}
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """ Raised instead of calling an endpoint whose circuit is open. """
+
+def configure_breakers(**settings):
+    """
+    Sets CircuitBreaker thresholds (window, min_calls, error_threshold, ...) for all endpoints.
+    Settings left out fall back to the defaults; existing breakers keep their open/closed state.
+    """
+    breaker_settings.clear()
+    breaker_settings.update(settings)
+    for endpoint, old in list(_breakers.items()):
+        _breakers[endpoint] = CircuitBreaker(endpoint, **breaker_settings)
+        _breakers[endpoint].carry_state_from(old)
+
+def breaker(endpoint):
+    if endpoint not in _breakers:
+        _breakers[endpoint] = CircuitBreaker(endpoint, **breaker_settings)
+    return _breakers[endpoint]
+
+def endpoint_health():
+    return {name: b.snapshot() for name, b in _breakers.items()}
+
+def degraded_endpoints(now=None):
+    """ Endpoints failing fast; an open circuit past its reset_timeout is due a probe and not counted. """
+    return [name for name, b in _breakers.items() if b.is_open(now)]
+
+def is_healthy(endpoint):
+    return breaker(endpoint).is_healthy()
+
+def _request(endpoint, method, url, **kwargs):
+    """ Sends one request through the endpoint's circuit breaker, recording outcome and latency. """
+    b = breaker(endpoint)
+    if not b.allow():
+        raise CircuitOpenError(f"circuit '{endpoint}' is open")
+    start = time.perf_counter()
+    try:
+        resp = requests.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+        resp.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+        # A 4xx other than 429 means the endpoint is up and rejected this request
+        if status is not None and status < 500 and status != 429:
+            b.record_success(time.perf_counter() - start)
+        else:
+            b.record_failure(time.perf_counter() - start)
+        raise
+    b.record_success(time.perf_counter() - start)
+    return resp
+
+def _read(endpoint, key, url, default=None, **kwargs):
+    """ GETs JSON; on failure or an open circuit returns the last-known value for `key` instead. """
+    try:
+        resp = _request(endpoint, "GET", url, **kwargs)
+        try:
+            data = resp.json()
+        finally:
+            resp.close()  # Hand the connection back to the pool right away on long runs
+    except (requests.exceptions.RequestException, ValueError) as e:
+        if not isinstance(e, CircuitOpenError):
+            print(f"❌ Error fetching {key}: {e}")
+        return _last_known.get(key, default)
+    _last_known[key] = data
+    return data
 
 def get_stocks():
-    return requests.get(f"{BASE_URL}/stocks", auth=auth).json()
+    return _read("stocks", "stocks", f"{BASE_URL}/stocks", auth=auth)
 
 def get_stock_history(symbol, interval="5m", points=50):
     params = {"interval": interval, "points": points}
-    return requests.get(f"{BASE_URL}/stocks/{symbol}/history", params=params, auth=auth).json()
+    return _read("history", f"history:{symbol}:{interval}:{points}", f"{BASE_URL}/stocks/{symbol}/history",
+                 default=[], params=params, auth=auth)
 
 def get_market_data(symbol, auth):
-    try:
-        stock_resp = requests.get(f"{BASE_URL}/stocks", auth=HTTPBasicAuth(*auth))
-        orderbook_resp = requests.get(f"{BASE_URL}/orderbook/?symbol={symbol}", auth=HTTPBasicAuth(*auth))
-        return {
-            "stock": next((s for s in stock_resp.json() if s["symbol"] == symbol), None),
-            "orderbook": orderbook_resp.json()
-        }
-    except Exception as e:
-        print(f"❌ Error fetching market data: {e}")
+    stocks = _read("stocks", "stocks", f"{BASE_URL}/stocks", auth=HTTPBasicAuth(*auth))
+    orderbook = _read("orderbook", f"orderbook:{symbol}", f"{BASE_URL}/orderbook/?symbol={symbol}",
+                      auth=HTTPBasicAuth(*auth))
+    if stocks is None or orderbook is None:
         return None
+    return {
+        "stock": next((s for s in stocks if s["symbol"] == symbol), None),
+        "orderbook": orderbook
+    }
 
 def get_account(auth):
-    try:
-        resp = requests.get(f"{BASE_URL}/accounts/{USER_ID}", auth=HTTPBasicAuth(*auth))
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"❌ Error fetching account: {e}")
-        return None
+    return _read("account", "account", f"{BASE_URL}/accounts/{USER_ID}", auth=HTTPBasicAuth(*auth))
 
 def place_order(user_id, symbol, side, quantity, order_type="market", limit_price=None, auth=None):
     data = {
@@ -47,12 +112,14 @@ def place_order(user_id, symbol, side, quantity, order_type="market", limit_pric
         data["limit_price"] = limit_price
 
     try:
-        resp = requests.post(f"{BASE_URL}/orders/", json=data, auth=HTTPBasicAuth(*auth))
-        resp.raise_for_status()
+        resp = _request("order_submit", "POST", f"{BASE_URL}/orders/", json=data, auth=HTTPBasicAuth(*auth))
         if resp.status_code == 400:  # Handle API overloads and rate-limits
             print(f"⚠️ Rate limit hit or bad request: {resp.text}")
             time.sleep(2)  # Add some delay if necessary
         return resp.json()
+    except CircuitOpenError as e:
+        print(f"⛔ Order not sent: {e}")
+        return None
     except requests.exceptions.RequestException as e:
         print(f"❌ Order failed: {e}")
         if hasattr(e, 'response') and hasattr(e.response, 'text'):
@@ -76,23 +143,27 @@ def cancel_all_orders_aggressively(auth):
 
 
 def get_orders(auth):
-    """ Fetch all open orders to process cancellation. """
+    """
+    Fetch all open orders. Returns None on failure so callers can tell it apart from an empty book.
+
+    Deliberately not served from cache: a stale list would make newly placed orders look filled.
+    """
     try:
-        orders_resp = requests.get(f"{BASE_URL}/orders", auth=auth)
-        orders_resp.raise_for_status()
+        orders_resp = _request("orders", "GET", f"{BASE_URL}/orders", auth=auth)
         return orders_resp.json()  # List of active orders
     except requests.exceptions.RequestException as e:
         print(f"❌ Error fetching orders: {e}")
-        return []
+        return None
 
 def cancel_order(order_id, auth):
     """ Attempt to cancel a single order using DELETE method. """
     try:
-        resp = requests.delete(f"{BASE_URL}/orders/{order_id}/cancel", auth=auth)
-        resp.raise_for_status()
+        _request("order_cancel", "DELETE", f"{BASE_URL}/orders/{order_id}/cancel", auth=auth)
         print(f"❎ Canceled order: {order_id}")
+        return True
     except requests.exceptions.RequestException as e:
         print(f"❌ Failed to cancel order {order_id}: {e}")
+        return False
 
 def cancel_all_orders(auth):
     """ Cancel all orders one by one. """
@@ -0,0 +1,46 @@
+# file: core/checkpoint.py
+import json, os, tempfile
+from pathlib import Path
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(state, path):
+    """
+    Atomically writes state as compact JSON.
+
+    The payload goes to a temp file in the same directory which is fsynced and then
+    renamed over the target, so a crash never leaves a half-written checkpoint.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps({"version": CHECKPOINT_VERSION, **state}, separators=(",", ":"))
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_checkpoint(path):
+    """ Returns the saved state, or None if there is no usable checkpoint. """
+    try:
+        with open(path, "r") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Ignoring unreadable checkpoint {path}: {e}")
+        return None
+    if state.get("version") != CHECKPOINT_VERSION:
+        print(f"⚠️ Ignoring checkpoint {path} with version {state.get('version')}")
+        return None
+    return state
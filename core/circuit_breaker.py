@@ -0,0 +1,117 @@
+# file: core/circuit_breaker.py
+import time
+from collections import deque
+
+
+class CircuitBreaker:
+    """
+    Health tracker and circuit breaker for one API endpoint.
+
+    Closed: calls go through and their outcome and latency land in a rolling window.
+    Open: calls fail fast until `reset_timeout` has passed. Half-open: one probe call is
+    let through; success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, name, window=20, min_calls=5, error_threshold=0.5, max_consecutive_failures=3, reset_timeout=15):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.max_consecutive_failures = max_consecutive_failures
+        self.reset_timeout = reset_timeout
+
+        self.results = deque(maxlen=window)  # (ok, latency seconds)
+        self.state = "closed"
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.consecutive_failures = 0
+        self.last_ok = None
+        self.total_calls = 0
+        self.total_failures = 0
+        self.fast_fails = 0
+
+    def carry_state_from(self, other):
+        """ Takes over another breaker's circuit state and history, e.g. when thresholds are reconfigured. """
+        self.results.extend(other.results)  # Trimmed to this breaker's window
+        for attr in ("state", "opened_at", "probe_in_flight", "consecutive_failures", "last_ok",
+                     "total_calls", "total_failures", "fast_fails"):
+            setattr(self, attr, getattr(other, attr))
+
+    # --- Gate ---
+    def allow(self, now=None):
+        """ Whether a call may be attempted right now. """
+        if self.state == "closed":
+            return True
+        now = time.monotonic() if now is None else now
+        if self.state == "open" and now - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.probe_in_flight = False
+        if self.state == "half_open" and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        self.fast_fails += 1
+        return False
+
+    # --- Outcomes ---
+    def record_success(self, latency):
+        self.results.append((True, latency))
+        self.total_calls += 1
+        self.consecutive_failures = 0
+        self.last_ok = True
+        if self.state != "closed":
+            print(f"✅ Circuit '{self.name}' closed — endpoint recovered")
+            self.state = "closed"
+            self.probe_in_flight = False
+            self.results.clear()
+
+    def record_failure(self, latency, now=None):
+        self.results.append((False, latency))
+        self.total_calls += 1
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self.last_ok = False
+        if self.state == "half_open":
+            self._open(now)
+        elif self.state == "closed" and (
+            self.consecutive_failures >= self.max_consecutive_failures
+            or (len(self.results) >= self.min_calls and self.error_rate() >= self.error_threshold)
+        ):
+            self._open(now)
+
+    def _open(self, now=None):
+        self.state = "open"
+        self.opened_at = time.monotonic() if now is None else now
+        self.probe_in_flight = False
+        print(f"⛔ Circuit '{self.name}' open — failing fast for {self.reset_timeout}s (error rate {self.error_rate():.0%})")
+
+    # --- Health ---
+    def is_open(self, now=None):
+        """ Open and still failing fast; once `reset_timeout` has passed the next call is a probe. """
+        if self.state != "open":
+            return False
+        now = time.monotonic() if now is None else now
+        return now - self.opened_at < self.reset_timeout
+
+    def is_healthy(self):
+        """ Closed and the most recent call succeeded, i.e. its data is fresh. """
+        return self.state == "closed" and self.last_ok is not False
+
+    def error_rate(self):
+        if not self.results:
+            return 0.0
+        return sum(1 for ok, _ in self.results if not ok) / len(self.results)
+
+    def avg_latency(self):
+        if not self.results:
+            return None
+        return sum(latency for _, latency in self.results) / len(self.results)
+
+    def snapshot(self):
+        avg_latency = self.avg_latency()
+        return {
+            "state": self.state,
+            "error_rate": round(self.error_rate(), 3),
+            "avg_latency_ms": round(avg_latency * 1000, 1) if avg_latency is not None else None,
+            "calls": self.total_calls,
+            "failures": self.total_failures,
+            "fast_fails": self.fast_fails,
+        }
@@ -1,29 +1,84 @@
 # file: core/config_manager.py
-import json
+import json, os, stat, tempfile
+from contextlib import contextmanager
 from pathlib import Path
 
 class ConfigManager:
     def __init__(self, config_path):
         self.config_path = Path(config_path).resolve()
+        self._batch_depth = 0
+        self._dirty = False
+        self._mtime = None
         self.config = self._load_config()
 
+    def _stat_key(self):
+        """ (mtime_ns, size) of the file, used to detect edits made by other processes. """
+        try:
+            st = os.stat(self.config_path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     def _load_config(self):
         """Loads configuration from the JSON file."""
         try:
+            stat_key = self._stat_key()
             with open(self.config_path, 'r') as file:
-                return json.load(file)
+                config = json.load(file)
         except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file not found at {self.config_path}")
         except json.JSONDecodeError:
             raise ValueError(f"Error decoding the JSON configuration file at {self.config_path}")
+        self._mtime = stat_key
+        return config
+
+    def reload_if_changed(self):
+        """
+        Reloads the config if the file changed on disk since it was last read or written.
+
+        Returns True if a new config was loaded. A file that is mid-edit or invalid raises
+        ValueError and leaves the current config in place.
+        """
+        if self._stat_key() == self._mtime:
+            return False
+        self.config = self._load_config()
+        return True
 
     def save_config(self):
-        """Saves the current config to the JSON file."""
+        """Atomically saves the current config: write a temp file, fsync, then rename over the original."""
+        if self._batch_depth:
+            self._dirty = True
+            return
         try:
-            with open(self.config_path, 'w') as file:
-                json.dump(self.config, file, indent=4)
+            fd, tmp_path = tempfile.mkstemp(dir=self.config_path.parent, prefix=f".{self.config_path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as file:
+                    json.dump(self.config, file, indent=4)
+                    file.flush()
+                    os.fsync(file.fileno())
+                # mkstemp creates the file 0600; keep config.json readable by whoever could read it before
+                if os.path.exists(self.config_path):
+                    os.chmod(tmp_path, stat.S_IMODE(os.stat(self.config_path).st_mode))
+                os.replace(tmp_path, self.config_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
         except IOError as e:
             raise IOError(f"Error saving configuration file: {str(e)}")
+        self._mtime = self._stat_key()
+        self._dirty = False
+
+    @contextmanager
+    def batch(self):
+        """Groups several set/update calls into a single write when the outermost batch exits."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0 and self._dirty:
+            self.save_config()
 
     def get(self, key, default=None):
         """Returns the value of a configuration key or default."""
@@ -1,9 +1,16 @@
-import time, json, argparse
+import time, argparse, inspect
+import signal as os_signal
 from pathlib import Path
 from core.api_client import (
     get_market_data,
     place_order,
-    get_account
+    get_account,
+    get_orders,
+    cancel_order,
+    configure_breakers,
+    degraded_endpoints,
+    endpoint_health,
+    is_healthy
 )
 from core.strategy_selector import select_strategy
 from core.strategy import (
@@ -14,73 +21,259 @@ from core.strategy import (
     is_volatile_enough
 )
 from core.logger import log_trade
-import pandas as pd
+from core.risk_management import RiskEngine
+from core.order_state import OrderStateBook
+from core.price_window import PriceWindow
+from core.checkpoint import save_checkpoint, load_checkpoint
+from core.profiling import MemoryProfiler
+from core.config_manager import ConfigManager
+from core.circuit_breaker import CircuitBreaker
 from core.api_client import get_stock_history
 
 # --- CONFIG LOAD ---
+# Config is read by configure() rather than at import, so importing the executor stays cheap
 CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.json"
-with open(CONFIG_PATH, "r") as f:
-    config = json.load(f)
-
-user_id = config["user_id"]
-symbol = config["symbol"]
-interval = config.get("interval", 2)
-stale_limit_lifetime = config.get("limit_lifetime", 180)
-cooldown_period = config.get("cooldown", 90)
-auth = (str(user_id), config["password"])
-
-strategy_fn, strategy_params = select_strategy(config.get("strategy", "multi_sma"))
+config_manager = None
+config = None
+user_id = symbol = auth = None
+interval = 2
+stale_limit_lifetime = 180
+cooldown_period = 90
+strategy_fn, strategy_params = None, {}
+risk = order_book = None
+profiler = MemoryProfiler()
+price_windows = {}
+checkpoint_path = None
+checkpoint_interval = 30
+breaker_config = None
+
+# Settings that can change while running, with their defaults
+TIMING_DEFAULTS = {"interval": 2, "limit_lifetime": 180, "cooldown": 90, "order_poll_interval": 10, "checkpoint_interval": 30}
+RISK_DEFAULTS = {
+    "max_position": 100, "max_notional": 1000, "max_open_orders": 20, "max_orders_per_minute": 30,
+    "reconcile_interval": 30, "reserved_open_orders": 2
+}
+BREAKER_KEYS = tuple(p for p in inspect.signature(CircuitBreaker.__init__).parameters if p not in ("self", "name"))
+BREAKER_COUNT_KEYS = ("window", "min_calls", "max_consecutive_failures")
+RESTART_ONLY_KEYS = ("user_id", "password", "symbol", "checkpoint_path")
+# State whose loss on a crash changes behaviour after restart; counters and prices wait for the periodic write
+RESTART_CRITICAL_KEYS = ("last_signal", "pending_limit_order_id", "last_trade_time", "last_exposure_time")
+
+def configure(cfg=None):
+    """ Loads config.json via ConfigManager (or applies the given dict) and builds the risk engine, order book and price windows """
+    global config_manager, config, user_id, symbol, auth, risk, order_book, checkpoint_path, profiler
+
+    if cfg is None:
+        config_manager = ConfigManager(CONFIG_PATH)
+        cfg = config_manager.config
+    config = cfg
+
+    user_id = config["user_id"]
+    symbol = config["symbol"]
+    auth = (str(user_id), config["password"])
+
+    risk = RiskEngine()
+    order_book = OrderStateBook()
+
+    checkpoint_path = Path(config.get("checkpoint_path", "state/executor_state.json"))
+    if not checkpoint_path.is_absolute():
+        checkpoint_path = CONFIG_PATH.parent / checkpoint_path
+
+    profiling_config = config.get("profiling", {})
+    profiler = MemoryProfiler(
+        enabled=profiling_config.get("enabled", False),
+        snapshot_every=profiling_config.get("snapshot_every", 100),
+        top=profiling_config.get("top", 10)
+    )
+    apply_tunables(config)
+
+def _check_number(name, value):
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+        raise ValueError(f"{name} must be a non-negative number, got {value!r}")
+
+def apply_tunables(cfg):
+    """
+    Validates and applies the settings that may change at runtime: timings, risk limits,
+    circuit breaker thresholds and strategy params. Raises ValueError without changing
+    anything if the config is invalid.
+    """
+    global interval, stale_limit_lifetime, cooldown_period, checkpoint_interval
+    global strategy_fn, strategy_params, price_windows, breaker_config
+
+    if not isinstance(cfg, dict):
+        raise ValueError(f"config must be a JSON object, got {type(cfg).__name__}")
+    for section in ("risk", "strategy_params", "circuit_breaker"):
+        if not isinstance(cfg.get(section, {}), dict):
+            raise ValueError(f"{section} must be an object, got {cfg[section]!r}")
+
+    new_fn, new_params = select_strategy(cfg.get("strategy", "multi_sma"), cfg.get("strategy_params"))
+    timings = {key: cfg.get(key, default) for key, default in TIMING_DEFAULTS.items()}
+    risk_config = cfg.get("risk", {})
+    unknown = set(risk_config) - set(RISK_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown risk settings: {', '.join(sorted(unknown))}")
+    limits = {key: risk_config.get(key, default) for key, default in RISK_DEFAULTS.items()}
+    for name, value in list(timings.items()) + [(f"risk.{k}", v) for k, v in limits.items()]:
+        _check_number(name, value)
+    if timings["interval"] <= 0:
+        raise ValueError("interval must be positive")
+    new_breaker_config = cfg.get("circuit_breaker", {})
+    unknown = set(new_breaker_config) - set(BREAKER_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown circuit_breaker settings: {', '.join(sorted(unknown))}")
+    for key, value in new_breaker_config.items():
+        _check_number(f"circuit_breaker.{key}", value)
+        if key in BREAKER_COUNT_KEYS and not isinstance(value, int):
+            raise ValueError(f"circuit_breaker.{key} must be an integer, got {value!r}")
+
+    interval = timings["interval"]
+    stale_limit_lifetime = timings["limit_lifetime"]
+    cooldown_period = timings["cooldown"]
+    checkpoint_interval = timings["checkpoint_interval"]
+    order_book.poll_interval = timings["order_poll_interval"]
+    for key, value in limits.items():
+        setattr(risk, key, value)  # Limits change in place; the ledger is kept
+
+    if new_breaker_config != breaker_config:
+        configure_breakers(**new_breaker_config)
+        breaker_config = new_breaker_config
+
+    # Windows only need rebuilding (and reseeding next tick) if their shape changed
+    if not price_windows or any(
+        strategy_params.get(key) != new_params[key] for key in ("fast_interval", "slow_interval", "points")
+    ):
+        price_windows = {
+            "fast": PriceWindow(new_params["fast_interval"], new_params["points"]),
+            "slow": PriceWindow(new_params["slow_interval"], new_params["points"]),
+        }
+    strategy_fn, strategy_params = new_fn, new_params
+
+def reload_config():
+    """ Hot reload at the tick boundary: applies an edited config.json if valid, else keeps the running settings """
+    global config
+    if config_manager is None:
+        return False
+    try:
+        if not config_manager.reload_if_changed():
+            return False
+        apply_tunables(config_manager.config)
+    except (ValueError, TypeError, OSError) as e:
+        print(f"❌ Config reload rejected, keeping current settings: {e}")
+        return False
+
+    for key in RESTART_ONLY_KEYS:
+        if config_manager.get(key) != config.get(key):
+            print(f"⚠️ '{key}' changed — takes effect after a restart")
+    config = config_manager.config
+    print(f"🔁 Config reloaded — interval={interval}s cooldown={cooldown_period}s strategy_params={strategy_params}")
+    return True
 
 # --- STATE ---
 last_signal = None
 last_price = None
 pending_limit_order_id = None
-pending_limit_timestamp = None
 last_trade_time = 0
 last_networth = None
 total_limit_orders = 0
 total_market_orders = 0
 total_signals = 0
 last_exposure_time = None
+last_checkpoint_time = 0
+last_checkpointed_state = None
+shutdown_requested = False
+
+# --- ORDER SUBMISSION ---
+def submit_order(symbol, side, quantity, order_type, price, limit_price=None, tag=None, layer=None):
+    """ Runs the local risk gate before sending an order and books it in the ledger and order book if accepted """
+    order_price = limit_price if order_type == "limit" else price
+    # Passive grid orders may not take the open-order slots reserved for signal trades
+    ok, reason = risk.check(symbol, side, quantity, order_price, use_reserve=tag != "passive")
+    if not ok:
+        print(f"🛡️ Risk gate blocked {order_type.upper()} {side.upper()} x{quantity} @ {order_price:.2f}: {reason}")
+        return None
+
+    resp = place_order(
+        user_id=str(user_id),
+        symbol=symbol,
+        side=side,
+        quantity=quantity,
+        order_type=order_type,
+        limit_price=limit_price,
+        auth=auth
+    )
+    if resp:
+        risk.record_order(symbol, side, quantity, order_price, order_type, resp)
+        if order_type == "limit":
+            order_book.track(resp, symbol, side, quantity, limit_price, tag=tag, layer=layer)
+    return resp
+
+def cancel_tracked_order(order_id):
+    """ Cancels one of our orders and frees its risk reservation """
+    if not cancel_order(order_id, auth):
+        return False
+    order_book.mark_cancelled(order_id)
+    risk.release_order(order_id)
+    return True
+
+# --- ORDER STATE ---
+def poll_order_state():
+    """ One batched get_orders poll: advances the order book and feeds detected fills into the risk ledger """
+    open_orders = get_orders(auth)
+    if open_orders is None:
+        return None
+    for event in order_book.reconcile(open_orders):
+        if event["event"] == "fill":
+            risk.record_fill(event["symbol"], event["side"], event["quantity"], event["price"], order_id=event["order_id"])
+            ttf = event.get("time_to_fill")
+            detail = f"after {ttf:.1f}s" if ttf is not None else "(partial)"
+            print(f"💥 FILL {event['side'].upper()} x{event['quantity']:g} @ {event['price']:.2f} {detail}")
+        else:
+            risk.release_order(event["order_id"])
+            print(f"❎ Order {event['order_id']} closed unfilled")
+    return open_orders
 
 # --- PASSIVE LAYERED LIMITS ---
-def maintain_passive_limit_orders(symbol, current_price, cash, position, volatility, auth, levels=3, spread_base=0.03, max_spread=0.15):
-    """ Adds volatility consideration to the passive grid strategy """
+def maintain_passive_limit_orders(symbol, current_price, cash, position, volatility, auth, levels=3, spread_base=0.03, max_spread=0.15, drift_tolerance=0.25):
+    """
+    Adds volatility consideration to the passive grid strategy.
+
+    Each layer keeps at most one resting order per side; it is only replaced once its price
+    drifts more than `drift_tolerance` of the layer spacing away from the recomputed target.
+    """
     spread = min(spread_base + 0.5 * volatility, max_spread)
     base_qty = compute_position_size(cash, current_price, volatility)
     passive_qty = max(1, int(base_qty * 0.5))
+    tolerance = current_price * spread * drift_tolerance
 
     print(f"🧮 Spread={spread:.2%}, Passive Qty={passive_qty}")
 
+    # Layers no longer in the grid (e.g. levels was lowered) are cancelled straight away
+    for order in order_book.by_tag("passive"):
+        if not order["cancel_requested"] and order["layer"] not in range(1, levels + 1):
+            cancel_tracked_order(order["order_id"])
+
     for i in range(1, levels + 1):
         offset = spread * i
-        buy_price = round(current_price * (1 - offset), 2)
-        sell_price = round(current_price * (1 + offset), 2)
-
-        resp_buy = place_order(
-            user_id=str(user_id),
-            symbol=symbol,
-            side="buy",
-            quantity=passive_qty,
-            order_type="limit",
-            limit_price=buy_price,
-            auth=auth
-        )
-        print(f"🟢 Layer {i} BUY @ {buy_price:.2f} → {resp_buy}")
-
-        if position >= passive_qty:
-            resp_sell = place_order(
-                user_id=str(user_id),
-                symbol=symbol,
-                side="sell",
-                quantity=passive_qty,
-                order_type="limit",
-                limit_price=sell_price,
-                auth=auth
-            )
-            print(f"🔴 Layer {i} SELL @ {sell_price:.2f} → {resp_sell}")
-        else:
-            print(f"⚠️ Skipped SELL layer {i} — not enough inventory ({position})")
+        for side, target, emoji in (
+            ("buy", round(current_price * (1 - offset), 2), "🟢"),
+            ("sell", round(current_price * (1 + offset), 2), "🔴"),
+        ):
+            resting = None
+            for order in order_book.at_layer(symbol, side, "passive", i):
+                if order["cancel_requested"]:
+                    continue
+                if resting is None and abs(order["price"] - target) <= tolerance:
+                    resting = order
+                else:
+                    cancel_tracked_order(order["order_id"])
+
+            if resting is not None:
+                print(f"{emoji} Layer {i} {side.upper()} @ {resting['price']:.2f} still resting (target {target:.2f})")
+            elif side == "sell" and position < passive_qty:
+                print(f"⚠️ Skipped SELL layer {i} — not enough inventory ({position})")
+            else:
+                resp = submit_order(symbol, side, passive_qty, "limit", current_price, limit_price=target, tag="passive", layer=i)
+                print(f"{emoji} Layer {i} {side.upper()} @ {target:.2f} → {resp}")
 
 # --- VOLATILITY ADJUSTMENT ---
 def adjust_volatility_filter(cooldown_period, last_trade_time, volatility, default_threshold=0.005, relaxed_threshold=0.008):
@@ -91,147 +284,275 @@ def adjust_volatility_filter(cooldown_period, last_trade_time, volatility, defau
         return relaxed_threshold
     return default_threshold
 
-# --- MAIN LOOP ---
-def run_trading_loop(interval=2):
-    global last_signal, last_price, pending_limit_order_id, pending_limit_timestamp
+# --- TICK ---
+def trade_tick():
+    """ One pass of the trading loop; returning early skips the rest of the tick """
+    global last_signal, last_price, pending_limit_order_id
     global last_trade_time, last_networth, total_limit_orders, total_market_orders, total_signals
     global last_exposure_time
 
-    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 🚀 Trading {symbol} at {interval}s intervals")
-
-    while True:
-        loop_start = time.time()
+    loop_start = time.time()
+    open_orders = poll_order_state() if order_book.needs_poll() or risk.needs_sync() else None
+    if risk.needs_sync():
+        # Periodic reconciliation; between syncs the ledger is advanced from our own orders and fills.
+        # A cached account from a failing endpoint would roll the ledger back, so only fresh data is used.
         account = get_account(auth)
-        cash = float(account.get("cash", 0))
-        positions = account.get("open_positions") or account.get("positions") or {}
-        position = positions.get(symbol, 0)
-
-        market_data = get_market_data(symbol, auth)
-        if not market_data or "stock" not in market_data:
-            print("⚠️ Skipping — no market data")
-            time.sleep(interval)
-            continue
-
-        current_price = market_data["stock"]["price"]
-        volatility = market_data["stock"].get("volatility", 0)
-        net_worth = float(account.get("networth", cash + position * current_price))
-        orderbook = market_data.get("orderbook", {})
-
-        print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] 💰 Cash=${cash:.2f} | Pos={position} | NW=${net_worth:.2f} | Price=${current_price:.2f} | Vol={volatility:.2%}")
-
-        # Fetch stock history for both fast and slow intervals
-        df_fast = pd.DataFrame(get_stock_history(symbol, interval="1m", points=50))
-        df_slow = pd.DataFrame(get_stock_history(symbol, interval="5m", points=50))
-
-        try:
-            signal = strategy_fn(symbol, **strategy_params)
-        except Exception as e:
-            print(f"❌ Strategy error: {e}")
-            time.sleep(interval)
-            continue
-
-        print(f"📊 Signal: {signal}")
-        total_signals += 1
-
-        if signal in ["buy", "sell"] and (loop_start - last_trade_time) < cooldown_period:
-            print(f"🕒 Cooldown active — skipping ({loop_start - last_trade_time:.1f}s)")
-            continue
-
-        if pending_limit_order_id:
-            age = time.time() - pending_limit_timestamp
-            if age > stale_limit_lifetime:
-                # Place market order as a backup if the limit order is stale
-                print(f"❌ Limit order {pending_limit_order_id} is stale, placing market order instead.")
-                resp = place_order(
-                    user_id=user_id,
-                    symbol=symbol,
-                    side=signal,
-                    quantity=qty,
-                    order_type="market",
-                    auth=auth
-                )
+        if is_healthy("account") and risk.sync(account, open_orders):
+            print(f"🔄 Ledger reconciled — {len(risk.open_orders)} open orders")
+        elif risk.last_sync is None:
+            print("⚠️ Skipping — no account data")
+            return
+    cash = risk.cash
+    position = risk.position(symbol)
+
+    market_data = get_market_data(symbol, auth)
+    if not market_data or "stock" not in market_data:
+        print("⚠️ Skipping — no market data")
+        return
+    stale = [endpoint for endpoint in ("stocks", "orderbook") if not is_healthy(endpoint)]
+    if stale:
+        # Cached quotes from a failing endpoint would feed stale bars to the windows and trade on an old price
+        print(f"⚠️ Skipping — stale market data from {', '.join(stale)}")
+        return
+
+    current_price = market_data["stock"]["price"]
+    volatility = market_data["stock"].get("volatility", 0)
+    net_worth = cash + position * current_price
+    orderbook = market_data.get("orderbook", {})
+
+    print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] 💰 Cash=${cash:.2f} | Pos={position} | NW=${net_worth:.2f} | Price=${current_price:.2f} | Vol={volatility:.2%}")
+
+    # Local fast/slow windows; history is only downloaded on a cold start or after a long gap
+    for window in price_windows.values():
+        if window.is_ready():
+            window.update(current_price)
+        else:
+            print(f"📥 Seeding {window.interval} price window from history")
+            history = get_stock_history(symbol, interval=window.interval, points=window.points)
+            if not is_healthy("history"):
+                # A failed call returns the last-known history, which may be hours old
+                print(f"⚠️ Skipping — stale history, {window.interval} window not seeded")
+                return
+            window.seed(history)
+    fast_history = price_windows["fast"].records()
+
+    try:
+        signal = strategy_fn(symbol, **strategy_params, fast_history=fast_history, slow_history=price_windows["slow"].records())
+    except Exception as e:
+        print(f"❌ Strategy error: {e}")
+        return
+
+    print(f"📊 Signal: {signal}")
+    total_signals += 1
+
+    if signal in ["buy", "sell"] and (loop_start - last_trade_time) < cooldown_period:
+        print(f"🕒 Cooldown active — skipping ({loop_start - last_trade_time:.1f}s)")
+        return
+
+    if pending_limit_order_id:
+        pending = order_book.get(pending_limit_order_id)
+        if pending is None:
+            print(f"✅ LIMIT order {pending_limit_order_id} closed")
+            pending_limit_order_id = None
+        elif time.time() - pending["placed_at"] > stale_limit_lifetime:
+            # Replace the unfilled remainder of a stale limit order with a market order
+            remaining = int(pending["quantity"] - pending["filled"])
+            print(f"❌ Limit order {pending_limit_order_id} is stale, placing market order for {remaining} instead.")
+            if cancel_tracked_order(pending_limit_order_id):
+                pending_limit_order_id = None
+                resp = submit_order(symbol, pending["side"], remaining, "market", current_price)
                 print(f"✅ Market order executed: {resp}")
-                pending_limit_order_id = None  # Reset pending limit order
-                last_trade_time = time.time()  # Log the trade time
-            else:
-                print(f"⏳ LIMIT order {pending_limit_order_id} alive for {age:.1f}s")
-
-        if signal != last_signal and signal in ["buy", "sell"]:
-            has_held_long = position > 0 and net_worth < (cash + position * current_price * 0.995)
-            price_delta = abs((last_price or current_price) - current_price) / current_price
-            loosen = volatility > 0.015 or has_held_long or price_delta > 0.01
-
-            print(f"[FILTER] ΔPrice={price_delta:.4f} | HeldLong={has_held_long} | Loosen={loosen}")
-            volatility_threshold = adjust_volatility_filter(cooldown_period, last_trade_time, volatility)
-            if not is_volatile_enough(df_fast, threshold=volatility_threshold):
-                print("❌ Blocked by volatility filter")
-                continue
-
-            band_ok = confirm_with_volatility_band(current_price, current_price, volatility)
-            ob_ok = confirm_with_orderbook_pressure(orderbook, signal)
-
-            if not loosen and band_ok != signal:
-                print("❌ Blocked by band filter")
-                continue
-            if not loosen and not ob_ok:
-                print("❌ Blocked by orderbook filter")
-                continue
-
-            qty = compute_position_size(cash, current_price, volatility)
-            if signal == "sell" and position < qty:
-                print("⚠️ Cannot SELL — insufficient holdings")
-                continue
-
-            buffer_pct = 0.005  # Tighter limit buffer
-            limit_price = round(current_price * (1 - buffer_pct), 2) if signal == "buy" else round(current_price * (1 + buffer_pct), 2)
-
-            print(f"📝 LIMIT {signal.upper()} @ {limit_price:.2f} x{qty}")
-            resp = place_order(
-                user_id=user_id,
-                symbol=symbol,
-                side=signal,
-                quantity=qty,
-                order_type="limit",
-                limit_price=limit_price,
-                auth=auth
-            )
-
-            print(f"✅ Execution Result: {resp}")
-            if resp:
-                log_trade(symbol, signal, qty, current_price, volatility, "limit", cash, net_worth)
-                if "order_id" in resp:
-                    pending_limit_order_id = resp["order_id"]
-                    pending_limit_timestamp = time.time()
-                last_trade_time = loop_start
-                total_limit_orders += 1
-                if signal == "buy" and position == 0:
-                    last_exposure_time = loop_start
-
-            last_signal = signal
+                if resp:
+                    total_market_orders += 1
+                    last_trade_time = time.time()
         else:
-            print("⏸ Signal unchanged.")
+            print(f"⏳ LIMIT order {pending_limit_order_id} alive for {time.time() - pending['placed_at']:.1f}s")
+
+    if signal != last_signal and signal in ["buy", "sell"]:
+        # The exchange's valuation from the last sync; the local net_worth is marked at current_price and can't differ
+        account_networth = risk.networth if risk.networth is not None else net_worth
+        has_held_long = position > 0 and account_networth < (cash + position * current_price * 0.995)
+        price_delta = abs((last_price or current_price) - current_price) / current_price
+        loosen = volatility > 0.015 or has_held_long or price_delta > 0.01
+
+        print(f"[FILTER] ΔPrice={price_delta:.4f} | HeldLong={has_held_long} | Loosen={loosen}")
+        volatility_threshold = adjust_volatility_filter(cooldown_period, last_trade_time, volatility)
+        if not is_volatile_enough(fast_history, threshold=volatility_threshold):
+            print("❌ Blocked by volatility filter")
+            return
+
+        band_ok = confirm_with_volatility_band(current_price, current_price, volatility)
+        ob_ok = confirm_with_orderbook_pressure(orderbook, signal)
+
+        if not loosen and band_ok != signal:
+            print("❌ Blocked by band filter")
+            return
+        if not loosen and not ob_ok:
+            print("❌ Blocked by orderbook filter")
+            return
+
+        qty = compute_position_size(cash, current_price, volatility)
+
+        buffer_pct = 0.005  # Tighter limit buffer
+        limit_price = round(current_price * (1 - buffer_pct), 2) if signal == "buy" else round(current_price * (1 + buffer_pct), 2)
+
+        print(f"📝 LIMIT {signal.upper()} @ {limit_price:.2f} x{qty}")
+        resp = submit_order(symbol, signal, qty, "limit", current_price, limit_price=limit_price, tag="signal")
+        if not resp:
+            # Blocked by the risk gate or rejected; last_signal stays so the signal is retried next tick
+            return
+
+        print(f"✅ Execution Result: {resp}")
+        log_trade(symbol, signal, qty, current_price, volatility, "limit", cash, net_worth)
+        if "order_id" in resp:
+            pending_limit_order_id = resp["order_id"]
+        last_trade_time = loop_start
+        total_limit_orders += 1
+        if signal == "buy" and position == 0:
+            last_exposure_time = loop_start
+
+        last_signal = signal
+    else:
+        print("⏸ Signal unchanged.")
 
+    degraded = degraded_endpoints()
+    if degraded:
+        print(f"🚧 Degraded mode — circuits open: {', '.join(degraded)} — passive grid suspended")
+    else:
         maintain_passive_limit_orders(symbol, current_price, cash, position, volatility, auth)
 
-        if last_exposure_time and position > 0:
-            print(f"⏱️ Exposure: {time.time() - last_exposure_time:.1f}s")
-        if last_networth is not None:
-            delta = net_worth - last_networth
-            print(f"💸 Net Worth Δ: {'+' if delta >= 0 else ''}{delta:.2f}")
-        last_networth = net_worth
-        last_price = current_price
+    if last_exposure_time and position > 0:
+        print(f"⏱️ Exposure: {time.time() - last_exposure_time:.1f}s")
+    if last_networth is not None:
+        delta = net_worth - last_networth
+        print(f"💸 Net Worth Δ: {'+' if delta >= 0 else ''}{delta:.2f}")
+    last_networth = net_worth
+    last_price = current_price
+
+    print(f"📊 Stats — Limit: {total_limit_orders} | Market: {total_market_orders} | Signals: {total_signals}")
+    print(f"📒 Orders — {order_book.summary()}")
+    health = endpoint_health()
+    print("🩺 Health — " + " | ".join(
+        f"{name}: {h['state']} err={h['error_rate']:.0%} lat="
+        + ("n/a" if h["avg_latency_ms"] is None else f"{h['avg_latency_ms']}ms")
+        for name, h in health.items()
+    ))
+    if profiler.enabled:
+        print(f"🧠 Memory — {profiler.metrics()}")
+
+# --- CHECKPOINTING ---
+def executor_state():
+    return {
+        "last_signal": last_signal,
+        "last_price": last_price,
+        "pending_limit_order_id": pending_limit_order_id,
+        "last_trade_time": last_trade_time,
+        "last_networth": last_networth,
+        "total_limit_orders": total_limit_orders,
+        "total_market_orders": total_market_orders,
+        "total_signals": total_signals,
+        "last_exposure_time": last_exposure_time,
+    }
+
+def critical_state(state=None):
+    state = executor_state() if state is None else state
+    return {key: state[key] for key in RESTART_CRITICAL_KEYS}
+
+def save_state():
+    global last_checkpoint_time, last_checkpointed_state
+    state = executor_state()
+    save_checkpoint({
+        "symbol": symbol,
+        "saved_at": time.time(),
+        "executor": state,
+        "orders": order_book.to_state(),
+        "price_windows": {name: window.to_state() for name, window in price_windows.items()},
+    }, checkpoint_path)
+    last_checkpoint_time = time.monotonic()
+    last_checkpointed_state = critical_state(state)
+
+def maybe_checkpoint():
+    """ Checkpoints immediately when restart-critical state changed, otherwise every checkpoint_interval seconds """
+    if critical_state() != last_checkpointed_state or time.monotonic() - last_checkpoint_time >= checkpoint_interval:
+        try:
+            save_state()
+        except OSError as e:
+            print(f"❌ Checkpoint failed: {e}")
+
+def restore_state():
+    """ Warm start: reloads executor state, tracked orders and price windows from the last checkpoint """
+    global last_signal, last_price, pending_limit_order_id
+    global last_trade_time, last_networth, total_limit_orders, total_market_orders, total_signals
+    global last_exposure_time, last_checkpointed_state
+    checkpoint = load_checkpoint(checkpoint_path)
+    if not checkpoint or checkpoint.get("symbol") != symbol:
+        print("🧊 Cold start — no checkpoint for this symbol")
+        return False
+
+    saved = checkpoint.get("executor", {})
+    last_signal = saved.get("last_signal")
+    last_price = saved.get("last_price")
+    pending_limit_order_id = saved.get("pending_limit_order_id")
+    last_trade_time = saved.get("last_trade_time", 0)
+    last_networth = saved.get("last_networth")
+    total_limit_orders = saved.get("total_limit_orders", 0)
+    total_market_orders = saved.get("total_market_orders", 0)
+    total_signals = saved.get("total_signals", 0)
+    last_exposure_time = saved.get("last_exposure_time")
+    order_book.load_state(checkpoint.get("orders", {}))
+    warm_windows = [
+        name for name, window in price_windows.items()
+        if window.load_state(checkpoint.get("price_windows", {}).get(name)) and window.is_ready()
+    ]
+    last_checkpointed_state = critical_state()
+    age = time.time() - checkpoint.get("saved_at", 0)
+    print(f"♨️ Warm start from checkpoint ({age:.0f}s old) — {len(order_book.orders)} tracked orders, warm windows: {warm_windows or 'none'}")
+    return True
+
+def request_shutdown(signum, frame):
+    global shutdown_requested
+    print(f"🛑 Received signal {signum} — finishing current tick")
+    shutdown_requested = True
 
-        print(f"📊 Stats — Limit: {total_limit_orders} | Market: {total_market_orders} | Signals: {total_signals}")
-        time.sleep(interval)
+# --- MAIN LOOP ---
+def run_trading_loop():
+    restore_state()
+    os_signal.signal(os_signal.SIGTERM, request_shutdown)
+    os_signal.signal(os_signal.SIGINT, request_shutdown)
+
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 🚀 Trading {symbol} at {interval}s intervals")
+    profiler.start()
+
+    while not shutdown_requested:
+        reload_config()
+        trade_tick()
+        maybe_checkpoint()
+        profiler.tick()
+
+        # Sleep in short slices so a shutdown request is honoured promptly
+        wake_at = time.monotonic() + interval
+        while not shutdown_requested and time.monotonic() < wake_at:
+            time.sleep(min(0.5, max(0, wake_at - time.monotonic())))
+
+    try:
+        save_state()
+    except OSError as e:
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] ❌ Final checkpoint failed: {e} — shut down without saving state")
+        return
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 💾 State checkpointed to {checkpoint_path} — shut down cleanly")
 
 # --- CLI ENTRY ---
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--live", action="store_true", help="Run in continuous trading mode")
+    parser.add_argument("--profile-memory", action="store_true", help="Enable tracemalloc snapshots and memory metrics")
     args = parser.parse_args()
+    configure()
+    if args.profile_memory:
+        profiler.enabled = True
 
     if args.live:
-        run_trading_loop(interval)
+        run_trading_loop()
     else:
         signal = strategy_fn(symbol, **strategy_params)
         print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 🧪 Would {signal.upper()} now!" if signal in ["buy", "sell"] else f"🧪 Signal: {signal}")
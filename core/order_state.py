@@ -0,0 +1,221 @@
+# file: core/order_state.py
+import time
+from collections import deque
+
+CLOSED_STATUSES = {"filled": "filled", "cancelled": "cancelled", "canceled": "cancelled", "rejected": "cancelled"}
+
+
+def is_closed(remote):
+    """ Whether an order reported by the exchange is already filled, cancelled or rejected. """
+    return str(remote.get("status", "")).lower() in CLOSED_STATUSES
+
+
+class OrderStateBook:
+    """
+    In-memory book of our own resting orders keyed by order_id.
+
+    Orders enter from `place_order` responses and are advanced by batched `get_orders`
+    polls, which is how fills and cancels are detected without per-order API calls.
+    """
+
+    def __init__(self, poll_interval=10):
+        self.poll_interval = poll_interval
+        self.orders = {}   # order_id -> record
+        self.levels = {}   # (symbol, side, price) -> set of order_ids
+        self.sides = {}    # (symbol, side) -> set of order_ids
+        self.layers = {}   # (symbol, side, tag, layer) -> set of order_ids, for grid-style orders
+        self.fill_times = deque(maxlen=200)
+        self.total_filled = 0
+        self.total_cancelled = 0
+        self.last_poll = None
+
+    # --- Indexing ---
+    @staticmethod
+    def _level(price):
+        return round(float(price), 2)
+
+    def _index(self, record):
+        key = (record["symbol"], record["side"])
+        self.sides.setdefault(key, set()).add(record["order_id"])
+        self.levels.setdefault(key + (self._level(record["price"]),), set()).add(record["order_id"])
+        if record.get("layer") is not None:
+            self.layers.setdefault(key + (record["tag"], record["layer"]), set()).add(record["order_id"])
+
+    def _unindex(self, record):
+        key = (record["symbol"], record["side"])
+        level = key + (self._level(record["price"]),)
+        layer = key + (record["tag"], record.get("layer"))
+        for index, k in ((self.sides, key), (self.levels, level), (self.layers, layer)):
+            ids = index.get(k)
+            if ids is not None:
+                ids.discard(record["order_id"])
+                if not ids:
+                    del index[k]
+
+    # --- Lookup ---
+    def get(self, order_id):
+        return self.orders.get(order_id)
+
+    def at_level(self, symbol, side, price):
+        return self.levels.get((symbol, side, self._level(price)), set())
+
+    def at_layer(self, symbol, side, tag, layer):
+        return [self.orders[oid] for oid in self.layers.get((symbol, side, tag, layer), ())]
+
+    def by_tag(self, tag):
+        return [o for o in self.orders.values() if o["tag"] == tag]
+
+    def by_side(self, symbol, side):
+        return [self.orders[oid] for oid in self.sides.get((symbol, side), ())]
+
+    def stale(self, max_age, tag=None, now=None):
+        now = time.time() if now is None else now
+        return [
+            o for o in self.orders.values()
+            if now - o["placed_at"] > max_age and (tag is None or o["tag"] == tag)
+        ]
+
+    def avg_time_to_fill(self):
+        return sum(self.fill_times) / len(self.fill_times) if self.fill_times else None
+
+    # --- Updates ---
+    def track(self, resp, symbol, side, quantity, price, tag=None, layer=None, now=None):
+        """
+        Adds an order from a `place_order` response. Returns the order_id, or None if the response had none.
+
+        `layer` identifies the grid slot an order fills (e.g. passive layer 2) so it can be
+        found and replaced by slot even after the target price has moved.
+        """
+        order_id = (resp or {}).get("order_id")
+        if not order_id:
+            return None
+        record = {
+            "order_id": order_id,
+            "symbol": symbol,
+            "side": side,
+            "quantity": float(quantity),
+            "filled": 0.0,
+            "price": float(price),
+            "tag": tag,
+            "layer": layer,
+            "placed_at": time.time() if now is None else now,
+            "cancel_requested": False,
+        }
+        self.orders[order_id] = record
+        self._index(record)
+        return order_id
+
+    def mark_cancelled(self, order_id):
+        """ Flags an order we asked to cancel so its disappearance from the poll is not read as a fill. """
+        record = self.orders.get(order_id)
+        if record:
+            record["cancel_requested"] = True
+
+    def _close(self, record, status, now):
+        del self.orders[record["order_id"]]
+        self._unindex(record)
+        if status == "filled":
+            self.total_filled += 1
+            self.fill_times.append(now - record["placed_at"])
+        else:
+            self.total_cancelled += 1
+
+    def needs_poll(self, now=None):
+        now = time.monotonic() if now is None else now
+        return self.last_poll is None or now - self.last_poll >= self.poll_interval
+
+    def reconcile(self, open_orders, now=None):
+        """
+        Applies one `get_orders` poll to the book.
+
+        Arguments:
+        - open_orders (list): Orders reported by the exchange; tracked orders missing from it are closed.
+
+        Returns:
+        - list: Events as dicts with "event" ("fill" or "cancel"), "order_id", "symbol", "side",
+          "quantity", "price" and, for completed fills, "time_to_fill".
+        """
+        now = time.time() if now is None else now
+        self.last_poll = time.monotonic()
+        reported = {o["order_id"]: o for o in open_orders if o.get("order_id")}
+        events = []
+
+        for order_id, record in list(self.orders.items()):
+            remote = reported.pop(order_id, None)
+            status = CLOSED_STATUSES.get(str((remote or {}).get("status", "")).lower())
+
+            if remote is not None and status is None:
+                filled = remote.get("filled_quantity")
+                if filled is None and remote.get("remaining_quantity") is not None:
+                    filled = record["quantity"] - float(remote["remaining_quantity"])
+                if filled is not None and float(filled) > record["filled"]:
+                    events.append(self._event("fill", record, float(filled) - record["filled"]))
+                    record["filled"] = float(filled)
+                continue
+
+            if status is None:
+                status = "cancelled" if record["cancel_requested"] else "filled"
+            remaining = record["quantity"] - record["filled"]
+            if status == "filled" and remaining > 0:
+                event = self._event("fill", record, remaining)
+                event["time_to_fill"] = now - record["placed_at"]
+                events.append(event)
+            elif status == "cancelled":
+                events.append(self._event("cancel", record, remaining))
+            self._close(record, status, now)
+
+        # Orders we did not place in this process (e.g. before a restart) are adopted as-is;
+        # closed ones are skipped and earlier fills are seeded so neither is booked as a new fill
+        for order_id, remote in reported.items():
+            if is_closed(remote):
+                continue
+            self.track(
+                remote,
+                remote.get("symbol"),
+                remote.get("side"),
+                remote.get("quantity", 0),
+                remote.get("limit_price") or remote.get("price") or 0,
+                now=now
+            )
+            self.orders[order_id]["filled"] = float(remote.get("filled_quantity") or 0)
+        return events
+
+    @staticmethod
+    def _event(kind, record, quantity):
+        return {
+            "event": kind,
+            "order_id": record["order_id"],
+            "symbol": record["symbol"],
+            "side": record["side"],
+            "quantity": quantity,
+            "price": record["price"],
+        }
+
+    def to_state(self):
+        return {
+            "orders": list(self.orders.values()),
+            "fill_times": list(self.fill_times),
+            "total_filled": self.total_filled,
+            "total_cancelled": self.total_cancelled,
+        }
+
+    def load_state(self, state):
+        self.orders.clear()
+        self.levels.clear()
+        self.sides.clear()
+        self.layers.clear()
+        for record in state.get("orders", []):
+            self.orders[record["order_id"]] = record
+            self._index(record)
+        self.fill_times.extend(state.get("fill_times", []))
+        self.total_filled = state.get("total_filled", 0)
+        self.total_cancelled = state.get("total_cancelled", 0)
+
+    def summary(self):
+        avg_ttf = self.avg_time_to_fill()
+        return {
+            "Open Orders": len(self.orders),
+            "Filled": self.total_filled,
+            "Cancelled": self.total_cancelled,
+            "Avg Time to Fill (s)": round(avg_ttf, 1) if avg_ttf is not None else None,
+        }
@@ -0,0 +1,73 @@
+# file: core/price_window.py
+import time
+from collections import deque
+
+INTERVAL_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def interval_to_seconds(interval):
+    """ Converts an API interval string like "1m" or "5m" to seconds. """
+    return int(interval[:-1]) * INTERVAL_SECONDS[interval[-1]]
+
+
+class PriceWindow:
+    """
+    Local rolling window of bar prices for one history interval.
+
+    Seeded once from `get_stock_history`, then advanced from the live price each tick
+    so the strategy does not need to re-download history on every loop.
+    """
+
+    def __init__(self, interval="1m", points=50, max_gap=5):
+        self.interval = interval
+        self.points = points
+        self.max_gap = max_gap
+        self.seconds = interval_to_seconds(interval)
+        self.prices = deque(maxlen=points)
+        self.last_bucket = None
+
+    def _bucket(self, now):
+        return int(now // self.seconds)
+
+    def is_ready(self, now=None):
+        """ False when unseeded or when too many bars were missed to fill the gap locally. """
+        if self.last_bucket is None or not self.prices:
+            return False
+        now = time.time() if now is None else now
+        return self._bucket(now) - self.last_bucket <= self.max_gap
+
+    def seed(self, history, now=None):
+        self.prices.clear()
+        for point in history or []:
+            if "price" in point:
+                self.prices.append(float(point["price"]))
+        self.last_bucket = self._bucket(time.time() if now is None else now) if self.prices else None
+
+    def update(self, price, now=None):
+        """ Updates the current bar with the latest price, carrying the last price across skipped bars. """
+        bucket = self._bucket(time.time() if now is None else now)
+        if self.last_bucket is None or not self.prices:
+            self.prices.append(float(price))
+        elif bucket == self.last_bucket:
+            self.prices[-1] = float(price)
+        elif bucket > self.last_bucket:
+            for _ in range(min(bucket - self.last_bucket - 1, self.points)):
+                self.prices.append(self.prices[-1])
+            self.prices.append(float(price))
+        else:
+            return
+        self.last_bucket = bucket
+
+    def records(self):
+        """ Window in the same shape as `get_stock_history` output. """
+        return [{"price": p} for p in self.prices]
+
+    def to_state(self):
+        return {"interval": self.interval, "last_bucket": self.last_bucket, "prices": list(self.prices)}
+
+    def load_state(self, state):
+        if not state or state.get("interval") != self.interval:
+            return False
+        self.prices = deque(state.get("prices", []), maxlen=self.points)
+        self.last_bucket = state.get("last_bucket")
+        return True
@@ -0,0 +1,89 @@
+# file: core/profiling.py
+import gc, os, sys, tracemalloc
+
+
+def rss_mb():
+    """ Current resident set size in MB (falls back to peak RSS where /proc is unavailable). """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+class MemoryProfiler:
+    """
+    Opt-in memory profiling for long-running processes.
+
+    When enabled, tracemalloc runs in the background and every `snapshot_every` ticks a
+    snapshot is diffed against the previous one to print the top growing allocation sites.
+    """
+
+    def __init__(self, enabled=False, snapshot_every=100, top=10, frames=1):
+        self.enabled = enabled
+        self.snapshot_every = snapshot_every
+        self.top = top
+        self.frames = frames
+        self.ticks = 0
+        self.last_snapshot = None
+        self.baseline_rss = None
+
+    def start(self):
+        if not self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.last_snapshot = self._snapshot()
+        self.baseline_rss = rss_mb()
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.last_snapshot = None
+
+    @staticmethod
+    def _snapshot():
+        # Leave out tracemalloc's own bookkeeping and import machinery
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def tick(self):
+        """ Counts a tick and prints a top-allocation diff every `snapshot_every` ticks. """
+        if not self.enabled:
+            return
+        self.ticks += 1
+        if self.ticks % self.snapshot_every == 0:
+            self.print_top_diff()
+
+    def top_diff(self):
+        """ Allocation sites that grew most since the previous snapshot; advances the snapshot. """
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self.last_snapshot, "lineno") if self.last_snapshot else []
+        self.last_snapshot = snapshot
+        return [s for s in stats if s.size_diff > 0][:self.top]
+
+    def print_top_diff(self):
+        print(f"🔬 Top allocation growth after {self.ticks} ticks:")
+        for stat in self.top_diff():
+            print(f"   {stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d} blocks) {stat.traceback}")
+
+    def metrics(self):
+        rss = rss_mb()
+        metrics = {
+            "rss_mb": round(rss, 1),
+            "gc_counts": gc.get_count(),
+            "gc_collections": [generation["collections"] for generation in gc.get_stats()],
+            "gc_objects": len(gc.get_objects()),
+        }
+        if self.baseline_rss is not None:
+            metrics["rss_growth_mb"] = round(rss - self.baseline_rss, 1)
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            metrics["traced_mb"] = round(current / 1024 ** 2, 2)
+            metrics["traced_peak_mb"] = round(peak / 1024 ** 2, 2)
+        return metrics
@@ -1,6 +1,144 @@
+import time
+from collections import deque
+
+from core.order_state import is_closed
+
+
 def should_trade(portfolio: dict, signal: str, symbol: str) -> bool:
     if signal == "buy" and symbol in portfolio.get("positions", {}):
         return False  # Already holding
     if signal == "sell" and symbol not in portfolio.get("positions", {}):
         return False  # Nothing to sell
-    return True
\ No newline at end of file
+    return True
+
+
+class RiskEngine:
+    """
+    In-process pre-trade risk gate backed by a local cash/position ledger.
+
+    The ledger is updated from our own orders and fills so each order can be checked
+    without an API round trip; `sync` reconciles it against `get_account` periodically.
+    """
+
+    def __init__(self, max_position=100, max_notional=1000, max_open_orders=20,
+                 max_orders_per_minute=30, reconcile_interval=30, reserved_open_orders=2):
+        self.max_position = max_position
+        self.max_notional = max_notional
+        self.max_open_orders = max_open_orders
+        self.max_orders_per_minute = max_orders_per_minute
+        self.reconcile_interval = reconcile_interval
+        self.reserved_open_orders = reserved_open_orders  # open-order slots only priority orders may use
+
+        self.cash = 0.0
+        self.networth = None  # Exchange-reported net worth from the last sync
+        self.positions = {}
+        self.open_orders = {}  # order_id -> {"symbol", "side", "quantity", "price"}
+        self.order_times = deque()
+        self.last_sync = None
+
+    # --- Reconciliation ---
+    def needs_sync(self, now=None):
+        now = time.monotonic() if now is None else now
+        return self.last_sync is None or now - self.last_sync >= self.reconcile_interval
+
+    def sync(self, account, open_orders=None, now=None):
+        """ Replaces the ledger with the exchange view. Returns False if there was nothing to sync from. """
+        if not account:
+            return False
+        self.cash = float(account.get("cash", self.cash))
+        if account.get("networth") is not None:
+            self.networth = float(account["networth"])
+        positions = account.get("open_positions") or account.get("positions") or {}
+        self.positions = {sym: float(qty) for sym, qty in positions.items()}
+        if open_orders is not None:
+            self.open_orders = {
+                o["order_id"]: {
+                    "symbol": o.get("symbol"),
+                    "side": o.get("side"),
+                    "quantity": float(o.get("quantity", 0)) - float(o.get("filled_quantity") or 0),
+                    "price": float(o.get("limit_price") or o.get("price") or 0),
+                }
+                for o in open_orders if o.get("order_id") and not is_closed(o)
+            }
+        self.last_sync = time.monotonic() if now is None else now
+        return True
+
+    # --- Ledger ---
+    def position(self, symbol):
+        return self.positions.get(symbol, 0)
+
+    def _reserved(self, symbol, side):
+        qty = cash = 0.0
+        for order in self.open_orders.values():
+            if order["symbol"] == symbol and order["side"] == side:
+                qty += order["quantity"]
+                cash += order["quantity"] * order["price"]
+        return qty, cash
+
+    def record_order(self, symbol, side, quantity, price, order_type, resp, now=None):
+        """ Books an accepted order: market orders are treated as filled, limit orders reserve cash/inventory. """
+        self.order_times.append(time.monotonic() if now is None else now)
+        if order_type == "market":
+            self.record_fill(symbol, side, quantity, price)
+        elif resp and resp.get("order_id"):
+            self.open_orders[resp["order_id"]] = {
+                "symbol": symbol,
+                "side": side,
+                "quantity": float(quantity),
+                "price": float(price),
+            }
+
+    def record_fill(self, symbol, side, quantity, price, order_id=None):
+        signed = quantity if side == "buy" else -quantity
+        self.positions[symbol] = self.positions.get(symbol, 0) + signed
+        self.cash -= signed * price
+        order = self.open_orders.get(order_id)
+        if order is not None:
+            # Partial fills shrink the reservation; it is dropped once fully filled
+            order["quantity"] -= quantity
+            if order["quantity"] <= 0:
+                del self.open_orders[order_id]
+
+    def release_order(self, order_id):
+        self.open_orders.pop(order_id, None)
+
+    # --- Checks ---
+    def check(self, symbol, side, quantity, price, now=None, use_reserve=True):
+        """
+        Validates an order against the local ledger and limits.
+
+        Orders checked with `use_reserve=False` (e.g. the passive grid) must leave
+        `reserved_open_orders` slots free for priority orders such as signal trades.
+
+        Returns:
+        - (bool, str): Whether the order may be sent, and the reason if not.
+        """
+        if quantity <= 0 or price <= 0:
+            return False, "non-positive quantity or price"
+
+        now = time.monotonic() if now is None else now
+        while self.order_times and now - self.order_times[0] > 60:
+            self.order_times.popleft()
+        if len(self.order_times) >= self.max_orders_per_minute:
+            return False, f"order rate cap ({self.max_orders_per_minute}/min)"
+        open_order_cap = self.max_open_orders if use_reserve else self.max_open_orders - self.reserved_open_orders
+        if len(self.open_orders) >= open_order_cap:
+            return False, f"open order cap ({open_order_cap})"
+
+        notional = quantity * price
+        if notional > self.max_notional:
+            return False, f"notional {notional:.2f} > {self.max_notional}"
+
+        reserved_qty, reserved_cash = self._reserved(symbol, side)
+        position = self.position(symbol)
+        if side == "buy":
+            if position + reserved_qty + quantity > self.max_position:
+                return False, f"position cap ({self.max_position})"
+            if notional > self.cash - reserved_cash:
+                return False, "insufficient cash"
+        elif side == "sell":
+            if quantity > position - reserved_qty:
+                return False, "insufficient holdings"
+        else:
+            return False, f"unknown side '{side}'"
+        return True, ""
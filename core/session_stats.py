@@ -1,6 +1,9 @@
 
 # file: core/session_stats.py
 from datetime import datetime
+from collections import deque
+
+SIGNAL_HISTORY_LIMIT = 1000
 
 class SessionStats:
     def __init__(self):
@@ -15,10 +18,14 @@ class SessionStats:
         self.last_position_entry_time = None
         self.max_drawdown = 0
         self.last_networth = None
-        self.signal_history = []
+        # Bounded so a multi-day session does not grow without limit; flips are counted as they happen
+        self.signal_history = deque(maxlen=SIGNAL_HISTORY_LIMIT)
+        self.signal_flips = 0
 
     def record_signal(self, signal):
         self.total_signals += 1
+        if self.signal_history and signal != self.signal_history[-1] and signal in ["buy", "sell"]:
+            self.signal_flips += 1
         self.signal_history.append(signal)
 
     def record_order(self, order_type):
@@ -57,12 +64,5 @@ class SessionStats:
             "Unfilled Limit Orders": self.unfilled_limit_orders,
             "Exposure Duration (min)": self.exposure_duration_minutes(),
             "Max Drawdown (%)": round(self.max_drawdown * 100, 2),
-            "Signal Flips": self._count_flips()
+            "Signal Flips": self.signal_flips
         }
-
-    def _count_flips(self):
-        flips = 0
-        for i in range(1, len(self.signal_history)):
-            if self.signal_history[i] != self.signal_history[i-1] and self.signal_history[i] in ["buy", "sell"]:
-                flips += 1
-        return flips
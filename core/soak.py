@@ -0,0 +1,147 @@
+# file: core/soak.py
+import argparse, contextlib, gc, io, itertools, random, shutil, sys, tempfile, time
+from pathlib import Path
+
+import core.executor as executor
+from core.profiling import MemoryProfiler, rss_mb
+
+
+class StubExchange:
+    """
+    In-process stand-in for the exchange API with a random-walk price.
+
+    Limit orders rest until the price crosses them, market orders fill immediately, so the
+    executor's order book, risk ledger and passive grid all see realistic churn.
+    """
+
+    def __init__(self, symbol, price=100.0, cash=10000.0, seed=7):
+        self.symbol = symbol
+        self.price = price
+        self.cash = cash
+        self.positions = {}
+        self.orders = {}
+        self.rng = random.Random(seed)
+        self.ids = itertools.count(1)
+
+    def _step(self):
+        self.price = max(1.0, round(self.price * (1 + self.rng.gauss(0, 0.01)), 2))
+
+    def _fill(self, side, quantity, price):
+        signed = quantity if side == "buy" else -quantity
+        self.positions[self.symbol] = self.positions.get(self.symbol, 0) + signed
+        self.cash -= signed * price
+
+    # --- API surface used by the executor ---
+    def get_account(self, auth):
+        return {"cash": self.cash, "open_positions": dict(self.positions)}
+
+    def get_market_data(self, symbol, auth):
+        self._step()
+        levels = range(1, 6)
+        return {
+            "stock": {"symbol": symbol, "price": self.price, "volatility": abs(self.rng.gauss(0.02, 0.01))},
+            "orderbook": {
+                "buy_orders": [{"price": round(self.price - i * 0.1, 2), "volume": self.rng.randint(1, 50)} for i in levels],
+                "sell_orders": [{"price": round(self.price + i * 0.1, 2), "volume": self.rng.randint(1, 50)} for i in levels],
+            },
+        }
+
+    def get_stock_history(self, symbol, interval="5m", points=50):
+        return [{"price": round(self.price * (1 + self.rng.gauss(0, 0.01)), 2)} for _ in range(points)]
+
+    def place_order(self, user_id, symbol, side, quantity, order_type="market", limit_price=None, auth=None):
+        order_id = f"stub-{next(self.ids)}"
+        if order_type == "market":
+            self._fill(side, quantity, self.price)
+        else:
+            self.orders[order_id] = {"order_id": order_id, "symbol": symbol, "side": side,
+                                     "quantity": quantity, "limit_price": limit_price}
+        return {"order_id": order_id, "status": "accepted"}
+
+    def get_orders(self, auth):
+        for order_id, order in list(self.orders.items()):
+            crossed = self.price <= order["limit_price"] if order["side"] == "buy" else self.price >= order["limit_price"]
+            if crossed:
+                self._fill(order["side"], order["quantity"], order["limit_price"])
+                del self.orders[order_id]
+        return list(self.orders.values())
+
+    def cancel_order(self, order_id, auth):
+        return self.orders.pop(order_id, None) is not None
+
+
+def install_stub(stub):
+    """ Points the executor's API functions at the stub exchange and keeps it away from logs/trades.csv. """
+    for name in ("get_account", "get_market_data", "get_stock_history", "place_order", "get_orders", "cancel_order"):
+        setattr(executor, name, getattr(stub, name))
+    executor.log_trade = lambda *args, **kwargs: None
+
+
+def run_soak(ticks=5000, warmup=500, max_growth_mb=5.0, snapshot_every=1000, seed=7):
+    """
+    Drives `ticks` executor ticks against a stub exchange and checks memory stays flat.
+
+    Returns:
+    - (bool, dict): Whether RSS growth after warmup stayed within `max_growth_mb`, and the metrics.
+    """
+    state_dir = tempfile.mkdtemp(prefix="algotrader-soak-")
+    executor.configure({
+        "user_id": "soak",
+        "password": "soak",
+        "symbol": "SOAK",
+        "cooldown": 0,
+        "limit_lifetime": 1,
+        "order_poll_interval": 0,
+        "checkpoint_path": str(Path(state_dir) / "executor_state.json"),
+        "risk": {"max_orders_per_minute": 10 ** 9, "reconcile_interval": 0},
+    })
+    stub = StubExchange(executor.symbol, seed=seed)
+    install_stub(stub)
+    profiler = MemoryProfiler(enabled=True, snapshot_every=snapshot_every)
+
+    sink = io.StringIO()
+    started = time.perf_counter()
+    for tick in range(1, ticks + 1):
+        with contextlib.redirect_stdout(sink):
+            executor.trade_tick()
+            executor.maybe_checkpoint()
+        sink.seek(0)
+        sink.truncate()
+
+        if tick == warmup:
+            gc.collect()
+            profiler.start()
+        elif tick > warmup:
+            profiler.tick()
+            if profiler.ticks % snapshot_every == 0:
+                print(f"[{tick}/{ticks}] {profiler.metrics()}")
+
+    gc.collect()
+    metrics = profiler.metrics()
+    metrics["ticks"] = ticks
+    metrics["ticks_per_s"] = round(ticks / (time.perf_counter() - started), 1)
+    metrics["open_orders"] = len(executor.order_book.orders)
+    profiler.stop()
+    shutil.rmtree(state_dir, ignore_errors=True)
+    return metrics.get("rss_growth_mb", 0) <= max_growth_mb, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory soak test of the executor against a stub exchange")
+    parser.add_argument("--ticks", type=int, default=5000, help="Number of ticks to drive")
+    parser.add_argument("--warmup", type=int, default=500, help="Ticks before the memory baseline is taken")
+    parser.add_argument("--max-growth-mb", type=float, default=5.0, help="Allowed RSS growth after warmup")
+    parser.add_argument("--snapshot-every", type=int, default=1000, help="Ticks between tracemalloc diffs")
+    args = parser.parse_args()
+
+    print(f"🧪 Soaking executor for {args.ticks} ticks (RSS at start {rss_mb():.1f} MB)")
+    ok, metrics = run_soak(args.ticks, args.warmup, args.max_growth_mb, args.snapshot_every)
+    print(f"📊 {metrics}")
+    if not ok:
+        print(f"❌ RSS grew {metrics['rss_growth_mb']} MB after warmup (limit {args.max_growth_mb} MB)")
+        sys.exit(1)
+    print("✅ Memory stayed flat")
+
+
+if __name__ == "__main__":
+    main()
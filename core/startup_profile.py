@@ -0,0 +1,63 @@
+# file: core/startup_profile.py
+import argparse, subprocess, sys, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "streamlit")
+
+
+def profile_imports(module):
+    """
+    Imports `module` in a fresh interpreter with `-X importtime`.
+
+    Returns:
+    - (float, list, str): Wall time in seconds for interpreter start + import, rows of
+      (self_us, cumulative_us, depth, name) and the child's stderr on failure (else "").
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    error = result.stderr if result.returncode != 0 else ""
+    return wall, rows, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile import-time cost of a worker entry point")
+    parser.add_argument("--module", default="core.executor", help="Module to import (default: core.executor)")
+    parser.add_argument("--budget", type=float, default=0.5, help="Startup budget in seconds (default: 0.5)")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    wall, rows, error = profile_imports(args.module)
+    if error:
+        print(f"❌ Importing {args.module} failed:\n{error.strip().splitlines()[-1]}")
+        sys.exit(2)
+
+    print(f"⏱️ {args.module}: {wall * 1000:.0f} ms wall (interpreter start + imports), budget {args.budget * 1000:.0f} ms")
+    print(f"\n{'cumulative':>12} {'self':>10}  module")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"{cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {'  ' * depth}{name}")
+
+    heavy = sorted({name.split(".")[0] for _, _, _, name in rows if name.split(".")[0] in HEAVY_MODULES})
+    if heavy:
+        print(f"\n⚠️ Heavy libraries on the startup path: {', '.join(heavy)}")
+
+    if wall > args.budget:
+        print(f"\n❌ Over budget by {(wall - args.budget) * 1000:.0f} ms")
+        sys.exit(1)
+    print("\n✅ Within startup budget")
+
+
+if __name__ == "__main__":
+    main()
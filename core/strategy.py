@@ -1,39 +1,59 @@
-import pandas as pd
 from core.api_client import get_stock_history, get_market_data
-import numpy as np
 
-# --- Core Strategy ---
-def multi_timeframe_sma_strategy(symbol, short=3, long=10, fast_interval="1m", slow_interval="5m", points=50):
-    df_fast = pd.DataFrame(get_stock_history(symbol, interval=fast_interval, points=points))
-    df_slow = pd.DataFrame(get_stock_history(symbol, interval=slow_interval, points=points))
+# Signal maths is plain Python over short price lists: it is faster than building
+# DataFrames for ~50 points and keeps pandas/NumPy off the executor's import path.
+
+# --- Helpers ---
+def _prices(data):
+    """ Extracts prices from a DataFrame, a list of history points or a list of numbers. """
+    if hasattr(data, "columns"):
+        return data["price"].tolist() if "price" in data.columns else []
+    prices = []
+    for point in data or []:
+        if not isinstance(point, dict):
+            prices.append(float(point))
+        elif "price" in point:
+            prices.append(float(point["price"]))
+    return prices
+
+def _sma_at(prices, window, end):
+    """ Mean of the `window` prices ending at index `end`, or None while the window is not full. """
+    if end + 1 < window:
+        return None
+    return sum(prices[end - window + 1:end + 1]) / window
+
+def _sma_above(prices, short, long, end):
+    sma_short = _sma_at(prices, short, end)
+    sma_long = _sma_at(prices, long, end)
+    return int(sma_short is not None and sma_long is not None and sma_short > sma_long)
 
-    if df_fast.empty or df_slow.empty or 'price' not in df_fast.columns or 'price' not in df_slow.columns:
+# --- Core Strategy ---
+def multi_timeframe_sma_strategy(symbol, short=3, long=10, fast_interval="1m", slow_interval="5m", points=50,
+                                 fast_history=None, slow_history=None):
+    """ Pass `fast_history`/`slow_history` (e.g. from a local PriceWindow) to skip the history download. """
+    if fast_history is None:
+        fast_history = get_stock_history(symbol, interval=fast_interval, points=points)
+    if slow_history is None:
+        slow_history = get_stock_history(symbol, interval=slow_interval, points=points)
+    fast = _prices(fast_history)
+    slow = _prices(slow_history)
+
+    if not fast or not slow:
         print("⚠️ Not enough data for multi-timeframe strategy")
         return "hold"
 
-    # FAST chart crossovers
-    df_fast['SMA_short'] = df_fast['price'].rolling(window=short).mean()
-    df_fast['SMA_long'] = df_fast['price'].rolling(window=long).mean()
-    df_fast['Signal'] = (df_fast['SMA_short'] > df_fast['SMA_long']).astype(int)
-    df_fast['Position'] = df_fast['Signal'].diff()
-
-    # SLOW chart trend confirmation
-    df_slow['SMA_short'] = df_slow['price'].rolling(window=short).mean()
-    df_slow['SMA_long'] = df_slow['price'].rolling(window=long).mean()
-    df_slow['Momentum'] = df_slow['SMA_short'] - df_slow['SMA_long']
-    df_slow['Trend'] = (df_slow['Momentum'] > 0).astype(int)
-
-    df_fast = df_fast.dropna(subset=['Position']).copy()
-    df_slow = df_slow.dropna(subset=['Trend']).copy()
-
-    if df_fast.empty or df_slow.empty:
+    # The first fast bar has no previous crossover state to diff against
+    if len(fast) < 2:
         return "hold"
 
-    fast_signal = df_fast.iloc[-1]["Position"]
-    slow_trend = df_slow.iloc[-1]["Trend"]
+    # FAST chart crossovers: +1 on a fresh golden cross, -1 on a fresh death cross
+    fast_signal = _sma_above(fast, short, long, len(fast) - 1) - _sma_above(fast, short, long, len(fast) - 2)
+
+    # SLOW chart trend confirmation
+    slow_trend = _sma_above(slow, short, long, len(slow) - 1)
 
     # 🚀 Loosen volatility to encourage trade during moderate noise
-    if not is_volatile_enough(df_fast, threshold=0.005):  # Updated threshold
+    if not is_volatile_enough(fast[1:], threshold=0.005):  # Updated threshold
         return "hold"
 
     if fast_signal == 1 and slow_trend == 1:
@@ -44,9 +64,14 @@ def multi_timeframe_sma_strategy(symbol, short=3, long=10, fast_interval="1m", s
         return "hold"
 
 # --- Filters ---
-def is_volatile_enough(df, threshold=0.005):  # Increased threshold
-    df['pct_change'] = df['price'].pct_change()
-    recent_vol = df['pct_change'].rolling(window=3).std().iloc[-1]
+def is_volatile_enough(prices, threshold=0.005, window=3):  # Increased threshold
+    """ True if the sample std of the last `window` price returns exceeds `threshold`. """
+    prices = _prices(prices)
+    if len(prices) < window + 1 or window < 2:
+        return False
+    returns = [prices[i] / prices[i - 1] - 1 for i in range(len(prices) - window, len(prices))]
+    mean = sum(returns) / window
+    recent_vol = (sum((r - mean) ** 2 for r in returns) / (window - 1)) ** 0.5
     return recent_vol > threshold
 
 def confirm_with_volatility_band(price, sma_long, volatility, multiplier=1.25):
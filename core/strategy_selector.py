@@ -1,13 +1,35 @@
 from core.strategy import multi_timeframe_sma_strategy
+from core.price_window import interval_to_seconds
 
-def select_strategy(strategy_name):
+def _validate_sma_params(params):
+    for key in ("short", "long", "points"):
+        if not isinstance(params[key], int) or isinstance(params[key], bool) or params[key] < 1:
+            raise ValueError(f"strategy_params.{key} must be a positive integer, got {params[key]!r}")
+    if params["short"] >= params["long"]:
+        raise ValueError(f"strategy_params.short ({params['short']}) must be below long ({params['long']})")
+    if params["long"] > params["points"]:
+        raise ValueError(f"strategy_params.long ({params['long']}) exceeds points ({params['points']})")
+    for key in ("fast_interval", "slow_interval"):
+        try:
+            interval_to_seconds(params[key])
+        except (TypeError, ValueError, KeyError, IndexError):
+            raise ValueError(f"strategy_params.{key} must look like '1m' or '5m', got {params[key]!r}")
+
+def select_strategy(strategy_name, overrides=None):
+    """ Returns the strategy function and its params: defaults updated with `overrides` (config strategy_params), validated. """
     if strategy_name == "multi_sma":
-        return multi_timeframe_sma_strategy, {
+        params = {
             "short": 2,
             "long": 5,
             "fast_interval": "1m",
             "slow_interval": "3m",
             "points": 50
         }
+        unknown = set(overrides or {}) - set(params)
+        if unknown:
+            raise ValueError(f"Unknown strategy_params for '{strategy_name}': {', '.join(sorted(unknown))}")
+        params.update(overrides or {})
+        _validate_sma_params(params)
+        return multi_timeframe_sma_strategy, params
     else:
         raise ValueError(f"Unknown strategy '{strategy_name}'")
@@ -1,8 +1,6 @@
 from pathlib import Path
 import streamlit as st
-import json, time, os
-import pandas as pd
-import matplotlib.pyplot as plt
+import time, os
 from datetime import datetime
 from pathlib import Path
 from core.api_client import get_account, get_market_data, place_order, cancel_all_orders
@@ -14,20 +12,38 @@ from core.strategy import (
     confirm_with_volatility_band
 )
 from core.logger import log_trade  # Import the logging function
+from core.config_manager import ConfigManager
 
 # --- Config ---
 CONFIG_PATH = Path(__file__).resolve().parent / "config.json"
 LOG_PATH = "logs/trades.csv"
-with open(CONFIG_PATH, "r") as f:
-    config = json.load(f)
+
+@st.cache_resource
+def get_config_manager():
+    return ConfigManager(CONFIG_PATH)
+
+# One manager across reruns; config.json is only re-parsed when its mtime changes
+config_manager = get_config_manager()
+config_error = None
+try:
+    config_manager.reload_if_changed()
+except (ValueError, OSError) as e:
+    config_error = f"Keeping previous config — {e}"
+config = config_manager.config
 user_id = config["user_id"]
 symbol = config["symbol"]
 strategy_name = config.get("strategy", "multi_sma")
 auth = (str(user_id), config["password"])
-strategy_fn, strategy_params = select_strategy(strategy_name)
+try:
+    strategy_fn, strategy_params = select_strategy(strategy_name, config.get("strategy_params"))
+except ValueError as e:
+    config_error = f"Invalid strategy_params, using defaults — {e}"
+    strategy_fn, strategy_params = select_strategy(strategy_name)
 
 # --- Page Setup ---
 st.set_page_config(page_title="Unified AlgoTrader Dashboard", layout="wide")
+if config_error:
+    st.sidebar.warning(config_error)
 st.sidebar.title("📊 Navigation")
 view = st.sidebar.radio("Select view", ["📈 Live Dashboard", "📚 Trade History"])
 
@@ -104,6 +120,8 @@ if view == "📈 Live Dashboard":
     sell_prices = [level.get("price") for level in sell_levels if "price" in level]
     sell_volumes = [level.get("volume", level.get("quantity", 0)) for level in sell_levels]
     if buy_prices and sell_prices:
+        import matplotlib.pyplot as plt  # Only paid for when there is a depth chart to draw
+
         buy_sorted = sorted(zip(buy_prices, buy_volumes), key=lambda x: -x[0])
         sell_sorted = sorted(zip(sell_prices, sell_volumes), key=lambda x: x[0])
         buy_prices_sorted, buy_volumes_sorted = zip(*buy_sorted)
@@ -118,6 +136,7 @@ if view == "📈 Live Dashboard":
         ax.set_title("Order Book Depth")
         ax.legend()
         st.pyplot(fig)
+        plt.close(fig)  # pyplot keeps every figure alive otherwise, leaking one per rerun
     else:
         st.warning("⚠️ No valid order book data available to plot.")
 
@@ -169,6 +188,9 @@ elif view == "📚 Trade History":
         st.warning("No trades logged yet.")
         st.stop()
 
+    import pandas as pd  # Only the history view needs pandas
+    from core.analytics import load_summary
+
     # Load and prepare data
     df = pd.read_csv(LOG_PATH)
 
@@ -217,7 +239,19 @@ elif view == "📚 Trade History":
     df_chart = df.copy().sort_values("timestamp")
     st.line_chart(df_chart.set_index("timestamp")[["net_worth"]])
 
-    # Scatter plot for Profit/Loss by date
-    st.markdown("### 📈 Profit/Loss Scatter")
-    df['profit_loss'] = df["net_worth"] - df["cash"]
-    st.scatter_chart(df.set_index("timestamp")[["profit_loss"]])
+    # FIFO round-trip PnL precomputed by `python -m core.analytics`
+    st.markdown("### 📈 Profit/Loss")
+    summary = load_summary()
+    if summary is None:
+        st.info("No PnL summary yet — run `python -m core.analytics` to build one.")
+    else:
+        totals = summary["totals"]
+        pnl_col1, pnl_col2, pnl_col3, pnl_col4 = st.columns(4)
+        pnl_col1.metric("Realized PnL", f"${totals['realized_pnl']:.2f}")
+        pnl_col2.metric("Unrealized PnL", f"${totals['unrealized_pnl']:.2f}")
+        pnl_col3.metric("Win Rate", f"{totals['win_rate']:.1%}" if totals["win_rate"] is not None else "n/a")
+        pnl_col4.metric("Avg Holding (min)", totals["avg_holding_minutes"] if totals["avg_holding_minutes"] is not None else "n/a")
+        st.caption(f"Turnover ${totals['turnover']:.2f} over {totals['round_trips']} round trips — summary generated {summary['generated_at']}")
+        st.dataframe(pd.DataFrame.from_dict(summary["symbols"], orient="index"), use_container_width=True)
+        with st.expander("🧾 Order Type Stats"):
+            st.json(summary["order_types"])